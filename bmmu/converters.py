@@ -0,0 +1,13 @@
+from datetime import date
+
+
+class IsoDateConverter:
+    """``<isodate:name>`` -- a YYYY-MM-DD path segment, handed to the view as a ``datetime.date``."""
+    regex = r'\d{4}-\d{2}-\d{2}'
+
+    def to_python(self, value):
+        # an impossible date (e.g. 2025-13-40) raises ValueError, which the resolver turns into a 404
+        return date.fromisoformat(value)
+
+    def to_url(self, value):
+        return value if isinstance(value, str) else value.isoformat()
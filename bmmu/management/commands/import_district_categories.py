@@ -3,10 +3,11 @@ import sys
 from pathlib import Path
 
 import pandas as pd
+from django.core.cache import cache
 from django.core.management.base import BaseCommand
 from django.db import IntegrityError, transaction
 
-from bmmu.models import District, DistrictCategory
+from bmmu.models import District, DistrictCategory, REFERENCE_CACHE_KEYS
 
 def normalize(s):
     if s is None:
@@ -103,4 +104,6 @@ class Command(BaseCommand):
                         except IntegrityError:
                             continue
 
+        # bulk_create sends no signals: drop the cached mandal / district / category lists
+        cache.delete_many(REFERENCE_CACHE_KEYS)
         self.stdout.write(self.style.SUCCESS(f"Inserted approx {created} DistrictCategory rows."))
@@ -2,9 +2,10 @@
 import csv
 import os
 from decimal import Decimal, InvalidOperation
+from django.core.cache import cache
 from django.core.management.base import BaseCommand
 from django.db import transaction
-from bmmu.models import District, Block, Panchayat, Village
+from bmmu.models import District, Block, Panchayat, Village, DISTRICT_BLOCKS_CACHE_KEY, REFERENCE_CACHE_KEYS
 
 # Config
 BATCH_SIZE = 1000
@@ -99,6 +100,8 @@ class Command(BaseCommand):
             if objs:
                 District.objects.bulk_create(objs, ignore_conflicts=True)
                 created += len(objs)
+        # bulk_create sends no District signals: drop the cached mandal / district / category lists
+        cache.delete_many(REFERENCE_CACHE_KEYS)
         self.stdout.write(self.style.SUCCESS(f"Imported districts: approx {created} (scanned {seen})"))
 
     def import_blocks(self, batch_size):
@@ -111,6 +114,7 @@ class Command(BaseCommand):
         created = 0
         objs = []
         seen = 0
+        touched_districts = set()
         with open(BLOCKS_CSV, newline="", encoding="utf-8") as f:
             reader = csv.DictReader(f)
             for row in reader:
@@ -138,6 +142,7 @@ class Command(BaseCommand):
                     district_name_en=row.get("district_name_en") or None,
                 )
                 objs.append(obj)
+                touched_districts.add(district_obj.district_id)
                 if len(objs) >= batch_size:
                     Block.objects.bulk_create(objs, ignore_conflicts=True)
                     created += len(objs)
@@ -146,6 +151,8 @@ class Command(BaseCommand):
             if objs:
                 Block.objects.bulk_create(objs, ignore_conflicts=True)
                 created += len(objs)
+        # bulk_create sends no Block signals: drop the cached block lists of the districts touched here
+        cache.delete_many([DISTRICT_BLOCKS_CACHE_KEY.format(did) for did in touched_districts])
         self.stdout.write(self.style.SUCCESS(f"Imported blocks: approx {created} (scanned {seen})"))
 
     def import_panchayats(self, batch_size):
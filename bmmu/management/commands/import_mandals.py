@@ -3,10 +3,11 @@ from pathlib import Path
 from collections import OrderedDict
 
 import pandas as pd
+from django.core.cache import cache
 from django.core.management.base import BaseCommand
 from django.db import transaction
 
-from bmmu.models import Mandal, District  
+from bmmu.models import Mandal, District, REFERENCE_CACHE_KEYS
 
 
 def normalize(s):
@@ -161,6 +162,9 @@ class Command(BaseCommand):
                     District.objects.bulk_update(slice_objs, ['mandal'])
                     total_updates += len(slice_objs)
 
+        # bulk_create / bulk_update send no signals: drop the cached mandal / district / category lists
+        cache.delete_many(REFERENCE_CACHE_KEYS)
+
         self.stdout.write(self.style.SUCCESS(f"Assigned mandal to {total_updates} district(s)."))
         if not_found:
             self.stderr.write(self.style.WARNING(f"Could not find {len(not_found)} district(s) referenced in the file. Sample:"))
@@ -5,10 +5,11 @@ import sys
 from pathlib import Path
 
 import pandas as pd
+from django.core.cache import cache
 from django.core.management.base import BaseCommand
 from django.db import transaction
 
-from bmmu.models import Block  # adjust app name if needed
+from bmmu.models import Block, DISTRICT_BLOCKS_CACHE_KEY  # adjust app name if needed
 
 # expected headers in the excel:
 # "Block Name" and "Which Blocks are Aspirational?"
@@ -111,4 +112,8 @@ class Command(BaseCommand):
                 updated_rows = Block.objects.filter(block_id=block_id).update(is_aspirational=is_asp)
                 updated += updated_rows
 
+        # queryset.update() skips the Block signals, so drop the cached per-district block lists here
+        district_ids = Block.objects.filter(block_id__in=[c[0] for c in changes]).values_list("district_id", flat=True).distinct()
+        cache.delete_many([DISTRICT_BLOCKS_CACHE_KEY.format(did) for did in district_ids])
+
         self.stdout.write(self.style.SUCCESS(f"Updated {updated} block(s) is_aspirational flag."))
@@ -4,11 +4,12 @@ import string
 from datetime import date, timedelta
 from pathlib import Path
 
+from django.core.cache import cache
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
 from django.db import transaction
 
-from bmmu.models import MasterTrainer, MasterTrainerCertificate, TrainingPlan
+from bmmu.models import MasterTrainer, MasterTrainerCertificate, TrainingPlan, TRAINER_CERT_CACHE_KEY
 
 User = get_user_model()
 
@@ -200,6 +201,7 @@ class Command(BaseCommand):
         # create certificates: every certificate must link to one of existing TrainingPlan rows
         certs_buffer = []
         cert_count = 0
+        cert_trainer_ids = set()
         for trainer in trainers_qs:
             num = random.randint(1, max_certs)
             for _ in range(num):
@@ -215,6 +217,7 @@ class Command(BaseCommand):
                     issued_on=issued_on
                 )
                 certs_buffer.append(cert)
+                cert_trainer_ids.add(trainer.id)
                 cert_count += 1
 
                 if len(certs_buffer) >= chunk:
@@ -227,5 +230,8 @@ class Command(BaseCommand):
             self.stdout.write(f"Final bulk inserted {len(certs_buffer)} certificates (total {cert_count})")
             certs_buffer = []
 
+        # bulk_create sends no certificate signals: drop the cached latest-certificate numbers ourselves
+        cache.delete_many([TRAINER_CERT_CACHE_KEY.format(tid) for tid in cert_trainer_ids])
+
         self.stdout.write(self.style.SUCCESS(f"Done. Trainers created: {created_count}; Certificates created: {cert_count}"))
         return
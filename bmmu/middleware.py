@@ -0,0 +1,19 @@
+# middleware.py
+from django.utils.functional import SimpleLazyObject
+
+from .utils import get_request_partner
+
+
+class PartnerMiddleware:
+    """
+    Expose the logged-in Training Partner as a lazy ``request.partner`` (None for anonymous users
+    and other roles): the lookup runs on first use, once per request, and views that never read it
+    pay nothing. Must come after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.partner = SimpleLazyObject(lambda: get_request_partner(request))
+        return self.get_response(request)
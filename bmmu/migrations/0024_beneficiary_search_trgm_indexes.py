@@ -0,0 +1,42 @@
+from django.db import migrations
+
+
+# Trigram GIN indexes backing the beneficiary global search (icontains on
+# shg_name / gram_panchayat / village). On PostgreSQL Django compiles
+# ``field__icontains=q`` to ``UPPER("field"::text) LIKE UPPER('%q%')``, so the
+# indexes are built on that same expression for the planner to use them.
+# Other backends (sqlite in development) have no pg_trgm and are skipped.
+TRGM_INDEXES = [
+    ('bmmu_ben_shg_name_trgm', 'shg_name'),
+    ('bmmu_ben_gram_panchayat_trgm', 'gram_panchayat'),
+    ('bmmu_ben_village_trgm', 'village'),
+]
+
+
+def create_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, column in TRGM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON bmmu_beneficiary '
+            f'USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+        )
+
+
+def drop_trgm_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, _column in TRGM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bmmu', '0023_alter_trainingpartnertargets_target_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trgm_indexes, drop_trgm_indexes),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.6 on 2026-10-17 11:06
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def populate_block_name_cache(apps, schema_editor):
+    Beneficiary = apps.get_model('bmmu', 'Beneficiary')
+    Block = apps.get_model('bmmu', 'Block')
+    Beneficiary.objects.filter(block__isnull=False).update(
+        block_name_cache=Subquery(Block.objects.filter(pk=OuterRef('block_id')).values('block_name_en')[:1])
+    )
+
+
+def create_block_name_trgm_index(apps, schema_editor):
+    # companion to 0024: trigram index for the block-name leg of the global search
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS bmmu_ben_block_name_trgm ON bmmu_beneficiary '
+        'USING gin ((UPPER(block_name_cache::text)) gin_trgm_ops)'
+    )
+
+
+def drop_block_name_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS bmmu_ben_block_name_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bmmu', '0024_beneficiary_search_trgm_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='beneficiary',
+            name='block_name_cache',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.RunPython(populate_block_name_cache, migrations.RunPython.noop),
+        migrations.RunPython(create_block_name_trgm_index, drop_block_name_trgm_index),
+    ]
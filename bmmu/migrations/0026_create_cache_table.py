@@ -0,0 +1,20 @@
+from django.core.management import call_command
+from django.db import migrations
+
+
+# settings.CACHES uses the database backend; create its table here so a plain
+# ``migrate`` is enough on a fresh deployment (createcachetable skips tables
+# that already exist).
+def create_cache_table(apps, schema_editor):
+    call_command('createcachetable', database=schema_editor.connection.alias, verbosity=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bmmu', '0025_beneficiary_block_name_cache'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_table, migrations.RunPython.noop),
+    ]
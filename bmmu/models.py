@@ -5,6 +5,8 @@ from django.conf import settings
 from django.utils.text import slugify
 from django.utils import timezone
 from django.core.exceptions import ValidationError
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
 
 # -------------------------
 # Core user model
@@ -98,6 +100,11 @@ class Block(models.Model):
             models.Index(fields=['block_name_en']),
         ]
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # keep the denormalized Beneficiary.block_name_cache in step (renames are rare)
+        Beneficiary.objects.filter(block=self).exclude(block_name_cache=self.block_name_en).update(block_name_cache=self.block_name_en)
+
     def __str__(self):
         return f"{self.block_name_en or self.block_id}"
 
@@ -171,6 +178,39 @@ class DistrictCategory(models.Model):
         return f"{self.district} -> {self.category_name}"
 
 
+# Geo reference data (mandals / districts / categories) changes rarely, so the
+# dashboard selectors read it from the cache; any write evicts the cached lists.
+# The signals below cover save/delete; the import commands write in bulk (no signals)
+# and delete REFERENCE_CACHE_KEYS themselves. settings.CACHES is shared across workers.
+REFERENCE_CACHE_TTL = 60 * 60
+MANDALS_CACHE_KEY = 'smmu:mandals'
+DISTRICTS_CACHE_KEY = 'smmu:districts'
+DISTRICT_CATEGORIES_CACHE_KEY = 'smmu:district_categories'
+REFERENCE_CACHE_KEYS = (MANDALS_CACHE_KEY, DISTRICTS_CACHE_KEY, DISTRICT_CATEGORIES_CACHE_KEY)
+
+
+def _evict_reference_cache(sender, **kwargs):
+    cache.delete_many(REFERENCE_CACHE_KEYS)
+
+
+for _reference_model in (Mandal, District, DistrictCategory):
+    post_save.connect(_evict_reference_cache, sender=_reference_model, dispatch_uid=f'evict_reference_cache_save_{_reference_model.__name__}')
+    post_delete.connect(_evict_reference_cache, sender=_reference_model, dispatch_uid=f'evict_reference_cache_delete_{_reference_model.__name__}')
+
+# Per-district block list (name + aspirational flag) for the DMMU dashboard. Evicted on Block
+# save/delete here and by the commands that write Blocks in bulk (mark_aspirational_blocks,
+# import_geo); settings.CACHES is shared across workers, so one eviction reaches them all.
+DISTRICT_BLOCKS_CACHE_KEY = 'dmmu:district_blocks:{}'
+
+
+def _evict_district_blocks_cache(sender, instance, **kwargs):
+    cache.delete(DISTRICT_BLOCKS_CACHE_KEY.format(instance.district_id))
+
+
+post_save.connect(_evict_district_blocks_cache, sender=Block, dispatch_uid='evict_district_blocks_cache_save')
+post_delete.connect(_evict_district_blocks_cache, sender=Block, dispatch_uid='evict_district_blocks_cache_delete')
+
+
 # -------------------------
 # TrainingPlan
 # -------------------------
@@ -244,6 +284,9 @@ class Beneficiary(models.Model):
         related_name='beneficiary_block',
         null=True, blank=True,
     )
+    # Denormalized Block.block_name_en so dashboard filter/sort/search on block name needs no JOIN.
+    # Maintained by Beneficiary.save() and Block.save().
+    block_name_cache = models.CharField(max_length=255, blank=True, null=True, db_index=True, editable=False)
     gram_panchayat = models.CharField(max_length=150, blank=True, null=True)
     village = models.CharField(max_length=150, blank=True, null=True)
 
@@ -320,6 +363,13 @@ class Beneficiary(models.Model):
             models.Index(fields=['aadhaar_no']),
         ]
 
+    def save(self, *args, **kwargs):
+        self.block_name_cache = self.block.block_name_en if self.block_id else None
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'block', 'block_id'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'block_name_cache'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.member_name or self.member_code or 'Beneficiary'} ({self.mobile_no or 'N/A'})"
 
@@ -851,6 +901,30 @@ class BatchBeneficiary(models.Model):
         return f"{beneficiary_label}{batch_label}"
 
 
+# Rendered closure fragment of a COMPLETED TrainingRequest (dmmu_request_detail). Dropped when anything
+# it shows is saved/deleted: the request, its batches, their beneficiaries and centres, and the plan.
+# The creator's name is only bounded by the TTL (views.REQUEST_CLOSURE_CACHE_TTL).
+REQUEST_CLOSURE_CACHE_KEY = 'dmmu:request_closure:{}'
+
+_CLOSURE_REQUEST_IDS = {
+    TrainingRequest: lambda obj: [obj.id],
+    Batch: lambda obj: [obj.request_id],
+    BatchBeneficiary: lambda obj: Batch.objects.filter(pk=obj.batch_id).values_list('request_id', flat=True),
+    TrainingPartnerCentre: lambda obj: Batch.objects.filter(centre=obj).values_list('request_id', flat=True).distinct(),
+    TrainingPlan: lambda obj: TrainingRequest.objects.filter(training_plan=obj).values_list('id', flat=True),
+}
+
+
+def _evict_request_closure_cache(sender, instance, **kwargs):
+    request_ids = {rid for rid in _CLOSURE_REQUEST_IDS[sender](instance) if rid}
+    if request_ids:
+        cache.delete_many([REQUEST_CLOSURE_CACHE_KEY.format(rid) for rid in request_ids])
+
+
+for _closure_model in _CLOSURE_REQUEST_IDS:
+    post_save.connect(_evict_request_closure_cache, sender=_closure_model, dispatch_uid=f'evict_request_closure_cache_save_{_closure_model.__name__}')
+    post_delete.connect(_evict_request_closure_cache, sender=_closure_model, dispatch_uid=f'evict_request_closure_cache_delete_{_closure_model.__name__}')
+
 # -------------------------
 # TrainerBatchParticipation
 # -------------------------
@@ -984,6 +1058,22 @@ class MasterTrainerCertificate(models.Model):
         return f"{self.trainer.full_name} - {self.training_module.training_name if self.training_module else 'Certificate'}"
 
 
+# Latest certificate number per trainer (see views._latest_certificate_numbers), dropped whenever
+# one of that trainer's certificates is saved or deleted (seed_master_trainers evicts after its
+# bulk_create). Evictions reach every worker through the shared settings.CACHES; a write that
+# bypasses both (raw SQL, queryset.update()) shows up within TRAINER_CERT_CACHE_TTL
+TRAINER_CERT_CACHE_KEY = 'trcert:{}'
+TRAINER_CERT_CACHE_TTL = 5 * 60
+
+
+def _evict_trainer_cert_cache(sender, instance, **kwargs):
+    cache.delete(TRAINER_CERT_CACHE_KEY.format(instance.trainer_id))
+
+
+post_save.connect(_evict_trainer_cert_cache, sender=MasterTrainerCertificate, dispatch_uid='evict_trainer_cert_cache_save')
+post_delete.connect(_evict_trainer_cert_cache, sender=MasterTrainerCertificate, dispatch_uid='evict_trainer_cert_cache_delete')
+
+
 # -------------------------
 # MasterTrainerExpertise
 # -------------------------
@@ -1251,6 +1341,8 @@ class BatchAttendance(models.Model):
     class Meta:
         verbose_name = "Batch Attendance"
         verbose_name_plural = "Batch Attendances"
+        # the unique (batch, date) index serves both the one-date lookup and a batch's dates in
+        # either order (read backwards for -date), so no separate index is needed
         unique_together = ('batch', 'date')
 
     def __str__(self):
@@ -60,7 +60,7 @@ class BeneficiaryResource(resources.ModelResource):
         import_id_fields = ("member_code",)
         skip_unchanged = True
         report_skipped = True
-        exclude = ("id", "created_at", "updated_at")
+        exclude = ("id", "created_at", "updated_at", "block_name_cache")
 
 
 # -------------------------
@@ -1,9 +1,12 @@
-from django.urls import path
+from django.urls import path, register_converter
 from . import views, tms_custom
+from .converters import IsoDateConverter
 
 from django.conf import settings
 from django.conf.urls.static import static
 
+register_converter(IsoDateConverter, 'isodate')
+
 urlpatterns = [
     path("", views.home_view, name="home"),
     path("login/", views.custom_login, name="custom_login"),
@@ -79,7 +82,7 @@ urlpatterns = [
     path('dmmu/request/<int:request_id>/', views.dmmu_request_detail, name='dmmu_request_detail'),
     path('dmmu/batch/<int:batch_id>/detail/', views.dmmu_batch_detail_ajax, name='dmmu_batch_detail_ajax'),
     path(
-        "dmmu/batch/<int:batch_id>/attendance/<str:date_str>/",
+        "dmmu/batch/<int:batch_id>/attendance/<isodate:the_date>/",
         views.dmmu_batch_attendance_date,
         name="dmmu_batch_attendance_date",
     ),
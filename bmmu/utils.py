@@ -33,3 +33,25 @@ def export_blueprint(resource_class, filename):
     response["Content-Disposition"] = f'attachment; filename="{filename}"'
     wb.save(response)
     return response
+
+
+def _get_partner_for_user(user):
+    """Return linked TrainingPartner instance or None (safe)."""
+    try:
+        return user.training_partner_profile
+    except Exception:
+        return None
+
+
+def get_request_partner(request):
+    """
+    The logged-in Training Partner of this request, or None for anonymous users and other roles.
+    Looked up at most once per request (cached on the request, as auth does for request.user).
+    """
+    if not hasattr(request, '_cached_partner'):
+        user = getattr(request, 'user', None)
+        partner = None
+        if user is not None and user.is_authenticated and getattr(user, 'role', '').lower() == 'training_partner':
+            partner = _get_partner_for_user(user)
+        request._cached_partner = partner
+    return request._cached_partner
@@ -1,5 +1,7 @@
 import os
+import re
 import json
+import hashlib
 import logging
 import random
 
@@ -9,27 +11,31 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.http import HttpResponseForbidden, HttpResponse, JsonResponse, HttpResponseBadRequest
 from django.core.paginator import Paginator
+from django.utils.functional import cached_property
 from django.template.loader import render_to_string
 from django.forms import modelform_factory
 from django.views.decorators.csrf import csrf_exempt
+from django.middleware.csrf import get_token
 from django.views.decorators.http import require_POST, require_http_methods
 from django.urls import reverse
-from django.db import transaction
+from django.db import transaction, connection
 from django.conf import settings
 from django import forms
 
 from .models import *
 
 from .resources import UserResource, BeneficiaryResource, TrainingPlanResource, MasterTrainerResource
-from .utils import export_blueprint
+from .utils import export_blueprint, get_request_partner
 from .forms import *
 
-from django.db.models import Q, F, Count
+from django.db.models import Q, F, Count, Value, CharField, IntegerField, Case, When
+from django.db.models.functions import Concat, Trim
 
 from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils.html import strip_tags
 from django.utils import timezone
+from django.core.cache import cache
 from django.db.models import Prefetch
 from datetime import date, datetime
 from django.db.models import OuterRef, Subquery
@@ -40,10 +46,32 @@ from django.utils.dateparse import parse_date
 from zoneinfo import ZoneInfo
 from urllib.parse import unquote, unquote_plus
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from dateutil import parser as _du_parser
+except ImportError:  # optional: only used as a last-resort date parser
+    _du_parser = None
+
+try:
+    import orjson
+except ImportError:  # optional: faster encoder for the HTML-carrying AJAX responses
+    orjson = None
 
 
 logger = logging.getLogger(__name__)
 
+try:
+    INDIA_TZ = ZoneInfo("Asia/Kolkata")
+except Exception:
+    INDIA_TZ = None
+
+
+def _india_today():
+    """Today's date in India time (falls back to the project timezone)."""
+    return datetime.now(tz=INDIA_TZ).date() if INDIA_TZ else timezone.localdate()
+
+
 def _get_trainer_for_user(user):
     """Return linked MasterTrainer instance or None (safe)."""
     try:
@@ -51,12 +79,45 @@ def _get_trainer_for_user(user):
     except Exception:
         return None
     
-def _get_partner_for_user(user):
-    """Return linked TrainingPartner instance or None (safe)."""
-    try:
-        return user.training_partner_profile
-    except Exception:
-        return None
+def _get_request_partner(request):
+    """
+    Partner of this request (or None), looked up at most once per request. Shares its cache with the
+    lazy request.partner set by PartnerMiddleware, but returns the plain object, so `is None` checks hold.
+    """
+    return get_request_partner(request)
+
+
+# "latest certificate" everywhere: newest issued_on (undated ones last, PostgreSQL sorts NULLs first on DESC), then created_at
+LATEST_CERTIFICATE_ORDERING = (F('issued_on').desc(nulls_last=True), F('created_at').desc())
+
+
+def _latest_certificate_numbers(trainer_ids):
+    """
+    {trainer_id: certificate_number} of each trainer's latest certificate (issued_on, then created_at).
+    Per-trainer results are cached (TRAINER_CERT_CACHE_KEY, evicted on certificate save/delete); only
+    the misses hit the DB, which returns one row per trainer: DISTINCT ON where available, a
+    correlated latest-pk subquery elsewhere.
+    """
+    trainer_ids = list(dict.fromkeys(trainer_ids))
+    keys = {tid: TRAINER_CERT_CACHE_KEY.format(tid) for tid in trainer_ids}
+    cached = cache.get_many(keys.values())
+    result = {tid: cached[key] for tid, key in keys.items() if key in cached}
+
+    missing = [tid for tid in trainer_ids if tid not in result]
+    if missing:
+        ordering = LATEST_CERTIFICATE_ORDERING
+        certs = MasterTrainerCertificate.objects.filter(trainer_id__in=missing)
+        if connection.vendor == 'postgresql':
+            certs = certs.order_by('trainer_id', *ordering).distinct('trainer_id')
+        else:
+            latest_pk = MasterTrainerCertificate.objects.filter(trainer_id=OuterRef('trainer_id')).order_by(*ordering).values('pk')[:1]
+            certs = certs.filter(pk=Subquery(latest_pk))
+        fetched = dict(certs.values_list('trainer_id', 'certificate_number'))
+        # trainers without a certificate are cached too (as None) so they don't re-query
+        cache.set_many({keys[tid]: fetched.get(tid) for tid in missing}, TRAINER_CERT_CACHE_TTL)
+        result.update((tid, fetched.get(tid)) for tid in missing)
+
+    return {tid: number for tid, number in result.items() if number is not None}
 
 
 def home_view(request):
@@ -717,11 +778,7 @@ def bmmu_request_detail(request, request_id):
         participants = []
 
     # minimal enrichment for display
-    try:
-        india_tz = ZoneInfo("Asia/Kolkata")
-    except Exception:
-        india_tz = None
-    today = datetime.now(tz=india_tz).date() if india_tz else timezone.localdate()
+    today = _india_today()
     
     for p in participants:
         dob = getattr(p, 'date_of_birth', None)
@@ -847,8 +904,7 @@ def bmmu_batch_attendance_date(request, batch_id, date_str):
             the_date = datetime.date.fromisoformat(raw.split('T')[0])
         except Exception:
             try:
-                from dateutil import parser as _du_parser
-                the_date = _du_parser.parse(raw).date()
+                the_date = _du_parser.parse(raw).date() if _du_parser is not None else None
             except Exception:
                 the_date = None
 
@@ -1761,7 +1817,7 @@ def training_partner_dashboard(request):
     if getattr(request.user, "role", "").lower() != "training_partner":
         return HttpResponseForbidden("Not authorized")
 
-    partner = _get_partner_for_user(request.user)
+    partner = _get_request_partner(request)
 
     # TrainingRequest: show PENDING requests that are either unassigned or assigned to this partner
     requests_qs = TrainingRequest.objects.filter(status='BATCHING').order_by('-created_at')
@@ -1852,7 +1908,7 @@ def training_partner_centre_registration(request):
         return HttpResponseForbidden("Not authorized")
 
     # ensure partner exists (best-effort)
-    partner = _get_partner_for_user(request.user)
+    partner = _get_request_partner(request)
     if not partner:
         partner = TrainingPartner.objects.create(user=request.user, name=request.user.get_full_name() or request.user.username)
         request.user.refresh_from_db()
@@ -1986,7 +2042,7 @@ def partner_propose_dates(request):
     except Exception as e:
         return JsonResponse({'ok': False, 'error': f'invalid payload: {e}'}, status=400)
 
-    partner = _get_partner_for_user(request.user)
+    partner = _get_request_partner(request)
     if not partner:
         return JsonResponse({'ok': False, 'error': 'no partner profile'}, status=400)
 
@@ -2076,7 +2132,7 @@ def partner_view_request(request, request_id):
     if getattr(request.user, "role", "").lower() != "training_partner":
         return HttpResponseForbidden("Not authorized")
 
-    partner = _get_partner_for_user(request.user)
+    partner = _get_request_partner(request)
     training_request = get_object_or_404(TrainingRequest.objects.select_related('training_plan', 'created_by'), id=request_id)
 
     # Authorization: only assigned partner may act (or request without a partner)
@@ -2250,12 +2306,8 @@ def partner_view_request(request, request_id):
     # trainer cert map (reuse existing logic)
     trainer_cert_map = {}
     try:
-        trainer_ids = [t.id for t in training_request.trainers.all()] if hasattr(training_request, 'trainers') else []
-        if trainer_ids:
-            certs = MasterTrainerCertificate.objects.filter(trainer_id__in=trainer_ids).order_by('trainer_id', '-issued_on', '-created_at')
-            for c in certs:
-                if c.trainer_id not in trainer_cert_map:
-                    trainer_cert_map[c.trainer_id] = c.certificate_number
+        # latest cert per trainer, served from the per-trainer cache where warm (dedup happens in SQL)
+        trainer_cert_map = _latest_certificate_numbers(training_request.trainers.values_list('id', flat=True))
     except Exception:
         trainer_cert_map = {}
 
@@ -2302,7 +2354,7 @@ def partner_view_requests(request):
     if getattr(request.user, "role", "").lower() != "training_partner":
         return HttpResponseForbidden("Not authorized")
 
-    partner = _get_partner_for_user(request.user)
+    partner = _get_request_partner(request)
     if not partner:
         return HttpResponseForbidden("No partner profile")
 
@@ -2412,7 +2464,7 @@ def partner_request_page(request, request_id):
     if getattr(request.user, "role", "").lower() != "training_partner":
         return HttpResponseForbidden("Not authorized")
 
-    partner = _get_partner_for_user(request.user)
+    partner = _get_request_partner(request)
     if not partner:
         return HttpResponseForbidden("No partner profile")
 
@@ -2548,13 +2600,9 @@ def partner_create_batches(request, request_id=None):
         return JsonResponse({'ok': False, 'error': 'unauthorized'}, status=403)
 
     # --- "today" in India time (use wherever "today" is needed) ---
-    try:
-        india_tz = ZoneInfo("Asia/Kolkata")
-    except Exception:
-        india_tz = None
-    today = timezone.now().astimezone(india_tz).date() if india_tz else timezone.localdate()
+    today = _india_today()
 
-    partner = _get_partner_for_user(request.user)
+    partner = _get_request_partner(request)
     try:
         payload = json.loads(request.body.decode('utf-8'))
     except Exception as e:
@@ -2876,16 +2924,12 @@ def partner_ongoing_trainings(request):
     if getattr(request.user, "role", "").lower() != "training_partner":
         return HttpResponseForbidden("Not authorized")
 
-    partner = _get_partner_for_user(request.user)
+    partner = _get_request_partner(request)
     if not partner:
         return HttpResponseForbidden("No partner profile")
 
     # timezone / today
-    try:
-        india_tz = ZoneInfo("Asia/Kolkata")
-    except Exception:
-        india_tz = None
-    today = datetime.now(tz=india_tz).date() if india_tz else timezone.localdate()
+    today = _india_today()
 
     status_param = (request.GET.get('status') or 'all').strip().lower()
 
@@ -3010,11 +3054,7 @@ def attendance_per_batch(request, batch_id):
     )
 
     # timezone / today
-    try:
-        india_tz = ZoneInfo("Asia/Kolkata")
-    except Exception:
-        india_tz = None
-    today = datetime.now(tz=india_tz).date() if india_tz else timezone.localdate()
+    today = _india_today()
 
     # helper: attach training_plan for templates
     training_plan = getattr(batch.request, 'training_plan', None) if getattr(batch, 'request', None) else None
@@ -3275,10 +3315,10 @@ def partner_upload_attendance(request, batch_id):
     if getattr(request.user, "role", "").lower() != "training_partner":
         return HttpResponseForbidden("Not authorized")
 
-    partner = _get_partner_for_user(request.user)
-    batch = get_object_or_404(Batch, id=batch_id)
+    partner = _get_request_partner(request)
+    batch = get_object_or_404(Batch.objects.select_related('request__training_plan'), id=batch_id)
 
-    if partner is None or batch.partner_id != partner.id:
+    if partner is None or getattr(batch.request, 'partner_id', None) != partner.id:
         return HttpResponseForbidden("Not your batch")
 
     if request.method == 'POST' and request.FILES.get('attendance_csv'):
@@ -3296,26 +3336,39 @@ def partner_upload_attendance(request, batch_id):
     return redirect('partner_view_batch', batch_id=batch.id)
 
 
+MEDIA_WRITE_WORKERS = 4
+MEDIA_WRITE_CHUNK_SIZE = 1 << 20
+
+
 @login_required
 def partner_upload_media(request, batch_id):
     if getattr(request.user, "role", "").lower() != "training_partner":
         return HttpResponseForbidden("Not authorized")
 
-    partner = _get_partner_for_user(request.user)
-    batch = get_object_or_404(Batch, id=batch_id)
+    partner = _get_request_partner(request)
+    batch = get_object_or_404(Batch.objects.select_related('request__training_plan'), id=batch_id)
 
-    if partner is None or batch.partner_id != partner.id:
+    if partner is None or getattr(batch.request, 'partner_id', None) != partner.id:
         return HttpResponseForbidden("Not your batch")
 
     if request.method == 'POST' and request.FILES.getlist('media_files'):
         files = request.FILES.getlist('media_files')
         target = os.path.join(settings.MEDIA_ROOT, f"partner_media/partner_{partner.id}/batch_{batch.id}")
         os.makedirs(target, exist_ok=True)
-        for f in files:
-            dest = os.path.join(target, f.name)
+
+        # one writer per destination: same-named files would otherwise interleave their writes;
+        # the last one wins, as it did when they were written one after another
+        by_dest = {os.path.join(target, f.name): f for f in files}
+
+        def _write(item):
+            dest, f = item
             with open(dest, 'wb+') as out:
-                for chunk in f.chunks():
+                for chunk in f.chunks(chunk_size=MEDIA_WRITE_CHUNK_SIZE):
                     out.write(chunk)
+
+        # files are independent and the writes are I/O bound: overlap them
+        with ThreadPoolExecutor(max_workers=min(MEDIA_WRITE_WORKERS, len(by_dest))) as ex:
+            list(ex.map(_write, by_dest.items()))
         messages.success(request, "Media uploaded.")
         return redirect('partner_view_batch', batch_id=batch.id)
 
@@ -3325,9 +3378,9 @@ def partner_upload_media(request, batch_id):
 
 @login_required
 def partner_generate_invoice(request, batch_id):
-    partner = _get_partner_for_user(request.user)
-    batch = get_object_or_404(Batch, id=batch_id)
-    if partner is None or batch.partner_id != partner.id:
+    partner = _get_request_partner(request)
+    batch = get_object_or_404(Batch.objects.select_related('request__training_plan'), id=batch_id)
+    if partner is None or getattr(batch.request, 'partner_id', None) != partner.id:
         return HttpResponseForbidden("Not your batch")
     messages.info(request, "Invoice generation is not implemented yet.")
     return redirect('partner_view_batch', batch_id=batch_id)
@@ -3395,6 +3448,41 @@ def nominate_batch(request):
         form = BatchNominateForm()
     return render(request, 'bmmu/nominate_batch.html', {'form': form})
 
+def _cached_mandals():
+    """Mandals as [{'id', 'name'}] ordered by name, served from the reference cache."""
+    return cache.get_or_set(
+        MANDALS_CACHE_KEY,
+        lambda: list(Mandal.objects.order_by('name').values('id', 'name')),
+        REFERENCE_CACHE_TTL,
+    )
+
+
+def _cached_districts():
+    """Districts as [{'district_id', 'district_name_en', 'mandal_id'}] ordered by name, cached."""
+    return cache.get_or_set(
+        DISTRICTS_CACHE_KEY,
+        lambda: list(District.objects.order_by('district_name_en').values('district_id', 'district_name_en', 'mandal_id')),
+        REFERENCE_CACHE_TTL,
+    )
+
+
+def _cached_district_categories():
+    """DistrictCategory rows as [{'id', 'category_name', 'district_id'}] ordered by category name, cached."""
+    return cache.get_or_set(
+        DISTRICT_CATEGORIES_CACHE_KEY,
+        lambda: list(DistrictCategory.objects.order_by('category_name', 'id').values('id', 'category_name', 'district_id')),
+        REFERENCE_CACHE_TTL,
+    )
+
+
+# Columns rendered by the SMMU and DMMU dashboard beneficiary tables (smmu/smmu_dashboard.html,
+# dmmu/dmmu_dashboard.html); both read the block name from block_name_cache
+BENEFICIARY_TABLE_FIELDS = (
+    "id", "block_name_cache", "gram_panchayat", "village", "shg_name", "member_name",
+    "social_category", "designation_in_shg_vo_clf", "gender", "date_of_birth",
+)
+
+
 @login_required
 def smmu_dashboard(request):
     """
@@ -3412,32 +3500,32 @@ def smmu_dashboard(request):
     chart2 = [random.randint(0, 100) for _ in range(10)]
     chart_labels = [f"Metric {i+1}" for i in range(10)]
 
-    # Selectors values
-    mandals = list(Mandal.objects.all().order_by("name"))
+    # Selectors values (cached reference data, see REFERENCE_CACHE_TTL)
+    mandals = _cached_mandals()
     mandal_id = request.GET.get("mandal_id")  # optional
 
     # district category selection is tied to District objects
     selected_mandal = None
     if mandal_id:
         try:
-            selected_mandal = Mandal.objects.get(pk=int(mandal_id))
+            mid = int(mandal_id)
+            selected_mandal = next((m for m in mandals if m["id"] == mid), None)
         except Exception:
             selected_mandal = None
 
     # District list (optionally filtered by mandal)
-    districts_qs = District.objects.all().order_by("district_name_en")
+    districts = _cached_districts()
     if selected_mandal:
-        districts_qs = districts_qs.filter(mandal=selected_mandal)
-    districts = list(districts_qs)
+        districts = [d for d in districts if d["mandal_id"] == selected_mandal["id"]]
 
     category_id = request.GET.get("category_id")
     # district category options — if a mandal is selected we can still show categories across districts in that mandal
-    district_categories_qs = DistrictCategory.objects.values("category_name").distinct().order_by("category_name")
+    district_categories_rows = _cached_district_categories()
     if selected_mandal:
         # categories attached to districts in this mandal
-        district_ids_for_mandal = districts_qs.values_list("district_id", flat=True)
-        district_categories_qs = district_categories_qs.filter(district__district_id__in=district_ids_for_mandal)
-    district_categories = [c["category_name"] for c in district_categories_qs]
+        district_ids_for_mandal = {d["district_id"] for d in districts}
+        district_categories_rows = [c for c in district_categories_rows if c["district_id"] in district_ids_for_mandal]
+    district_categories = list(dict.fromkeys(c["category_name"] for c in district_categories_rows))
 
     # selected district (this triggers table display)
     selected_district_id = request.GET.get("district_id")
@@ -3454,7 +3542,7 @@ def smmu_dashboard(request):
     show_table = False
     if selected_district:
         show_table = True
-        beneficiaries_qs = Beneficiary.objects.filter(district=selected_district).select_related("district", "block")
+        beneficiaries_qs = Beneficiary.objects.filter(district=selected_district)
 
     # Apply search / filter / sort behaviour
     # For safety and to avoid touching the global _apply_search_filter_sort function, apply minimal logic:
@@ -3466,7 +3554,7 @@ def smmu_dashboard(request):
     q = request.GET.get("search", "").strip()
     if q and show_table:
         qobj = Q()
-        qobj |= Q(block__block_name_en__icontains=q)  # block foreign key string
+        qobj |= Q(block_name_cache__icontains=q)  # denormalized Block.block_name_en
         qobj |= Q(shg_name__icontains=q)
         qobj |= Q(gram_panchayat__icontains=q)
         qobj |= Q(village__icontains=q)
@@ -3478,21 +3566,22 @@ def smmu_dashboard(request):
         "social_category", "designation_in_shg_vo_clf", "gender"
     }
 
+    # collect every filter_<field> into one kwargs dict -> a single .filter() call
+    filter_kwargs = {}
     for key, val in request.GET.items():
         if not key.startswith("filter_") or not val:
             continue
-        fld = key.replace("filter_", "")
+        fld = key[len("filter_"):]
         if fld not in ALLOWED_FILTERS:
             continue
         vals = [v.strip() for v in val.split(",") if v.strip()]
         if not vals:
             continue
-        if fld == "block":
-            # blocks come from Block.block_name_en; match by name
-            beneficiaries_qs = beneficiaries_qs.filter(block__block_name_en__in=vals)
-        else:
-            # plain fields on Beneficiary
-            beneficiaries_qs = beneficiaries_qs.filter(**{f"{fld}__in": vals})
+        # blocks come from Block.block_name_en (denormalized onto block_name_cache); others are plain fields
+        lookup = "block_name_cache" if fld == "block" else fld
+        filter_kwargs[f"{lookup}__in"] = vals
+    if filter_kwargs:
+        beneficiaries_qs = beneficiaries_qs.filter(**filter_kwargs)
 
     # Sorting
     sort_by = request.GET.get("sort_by", "")
@@ -3503,9 +3592,9 @@ def smmu_dashboard(request):
     }
     if sort_by in allowed_sort_fields:
         sort_field = sort_by
-        # for block sorting, use block__block_name_en
+        # for block sorting, use the denormalized block name (no JOIN)
         if sort_by == "block":
-            sort_field = "block__block_name_en"
+            sort_field = "block_name_cache"
         if order == "desc":
             beneficiaries_qs = beneficiaries_qs.order_by(f"-{sort_field}")
         else:
@@ -3517,7 +3606,11 @@ def smmu_dashboard(request):
     paginator = None
     page_obj = []
     if show_table:
-        paginator = Paginator(beneficiaries_qs, 20)
+        # the table is read-only: page over plain dicts with just the rendered columns;
+        # the row count comes from the shared count cache instead of a fresh COUNT per page load
+        paginator = InjectedCountPaginator(
+            beneficiaries_qs.values(*BENEFICIARY_TABLE_FIELDS), 20, count=_cached_count(beneficiaries_qs)
+        )
         page_number = request.GET.get("page", 1)
         page_obj = paginator.get_page(page_number)
     else:
@@ -3528,9 +3621,16 @@ def smmu_dashboard(request):
     groupable_values = {}
     # Blocks: use Block model for block names in the selected district
     if selected_district:
-        blocks_for_district = list(Block.objects.filter(district=selected_district).order_by("block_name_en").values_list("block_name_en", flat=True).distinct())
-        # mark aspirational blocks (we will flag in template)
-        aspirational_blocks = set(Block.objects.filter(district=selected_district, is_aspirational=True).values_list("block_name_en", flat=True))
+        # one query for names + aspirational flag (flagged in template)
+        block_rows = Block.objects.filter(district=selected_district).order_by("block_name_en").values_list("block_name_en", "is_aspirational")
+        blocks_for_district = []
+        aspirational_blocks = set()
+        for name, is_aspirational in block_rows:
+            # rows are ordered by name, so duplicates are adjacent (keeps the old .distinct())
+            if not blocks_for_district or blocks_for_district[-1] != name:
+                blocks_for_district.append(name)
+            if is_aspirational:
+                aspirational_blocks.add(name)
     else:
         blocks_for_district = []
         aspirational_blocks = set()
@@ -3569,7 +3669,7 @@ def smmu_dashboard(request):
         "mandals": mandals,
         "districts": districts,
         "district_categories": district_categories,
-        "selected_mandal": getattr(selected_mandal, "id", None) if selected_mandal else None,
+        "selected_mandal": selected_mandal["id"] if selected_mandal else None,
         "selected_category": int(category_id) if category_id and category_id.isdigit() else None,
         "selected_district": getattr(selected_district, "district_id", None) if selected_district else None,
         "page_obj": page_obj,
@@ -3592,6 +3692,20 @@ def smmu_dashboard(request):
     default_content = render_to_string("smmu/smmu_dashboard.html", context, request=request)
     return render(request, "dashboard.html", {"user": request.user, "default_content": default_content})
 
+class InjectedCountPaginator(Paginator):
+    """Paginator that takes an already-known row count instead of issuing its own COUNT(*)."""
+
+    def __init__(self, object_list, per_page, count=None, **kwargs):
+        self._injected_count = count
+        super().__init__(object_list, per_page, **kwargs)
+
+    @cached_property
+    def count(self):
+        if self._injected_count is None:
+            return super().count
+        return self._injected_count
+
+
 def smmu_fragment_context(request, paginate=True):
     """
     Build context for SMMU fragment.
@@ -3601,8 +3715,8 @@ def smmu_fragment_context(request, paginate=True):
      - training plans where current user is theme_expert, along with their batches
     """
     # 1. Mandals and district categories for the selects
-    mandals = list(Mandal.objects.all().order_by('name').values('id', 'name'))
-    district_categories = list(DistrictCategory.objects.all().order_by('category_name').values('id', 'category_name'))
+    mandals = _cached_mandals()
+    district_categories = [{'id': c['id'], 'category_name': c['category_name']} for c in _cached_district_categories()]
 
     # 2. If district provided, prepare beneficiaries queryset; otherwise empty
     district_id = request.GET.get('district_id') or request.GET.get('district')
@@ -3622,9 +3736,10 @@ def smmu_fragment_context(request, paginate=True):
             # if anything fails, fall back to unfiltered qs
             pass
 
-    # 4. Pagination
+    # 4. Pagination (count once; the paginator and beneficiaries_count share it)
+    beneficiaries_count = beneficiaries_qs.count()
     if paginate:
-        paginator = Paginator(beneficiaries_qs, 20)
+        paginator = InjectedCountPaginator(beneficiaries_qs, 20, count=beneficiaries_count)
         page_number = request.GET.get('page', 1)
         page_obj = paginator.get_page(page_number)
     else:
@@ -3665,7 +3780,7 @@ def smmu_fragment_context(request, paginate=True):
         'district_categories': district_categories,
         'page_obj': page_obj,
         'paginator': paginator,
-        'beneficiaries_count': beneficiaries_qs.count() if hasattr(beneficiaries_qs, 'count') else 0,
+        'beneficiaries_count': beneficiaries_count,
         'training_plans': plans_list,
     }
     return context
@@ -3719,26 +3834,17 @@ def smmu_request_detail(request, batch_id):
         return HttpResponseForbidden("Not authorized")
 
     batch = get_object_or_404(
-        Batch.objects.select_related('training_plan', 'partner')
-        .prefetch_related('trainers', 'beneficiaries'),
+        Batch.objects.select_related('request__training_plan', 'request__partner', 'centre')
+        .prefetch_related('trainers', 'batch_beneficiaries__beneficiary'),
         id=batch_id,
-        training_plan__theme_expert=request.user
+        request__training_plan__theme_expert=request.user
     )
+    # helper: attach training_plan / partner for templates (they hang off batch.request)
+    setattr(batch, 'training_plan', batch.request.training_plan)
+    setattr(batch, 'partner', batch.request.partner)
 
-    trainer_cert_map = {}
-    trainer_ids = [t.id for t in batch.trainers.all()]
-    if trainer_ids:
-        certs = MasterTrainerCertificate.objects.filter(trainer_id__in=trainer_ids).order_by('trainer_id', '-issued_on', '-created_at')
-        for c in certs:
-            prev = trainer_cert_map.get(c.trainer_id)
-            if not prev:
-                trainer_cert_map[c.trainer_id] = {'certificate_number': c.certificate_number, 'issued_on': c.issued_on, 'created_at': c.created_at}
-            else:
-                prev_issued = prev.get('issued_on')
-                cur_issued = c.issued_on
-                if (cur_issued and (not prev_issued or cur_issued > prev_issued)) or (not prev_issued and not cur_issued and c.created_at > prev.get('created_at')):
-                    trainer_cert_map[c.trainer_id] = {'certificate_number': c.certificate_number, 'issued_on': c.issued_on, 'created_at': c.created_at}
-    trainer_cert_map = {k: (v['certificate_number'] if v and v.get('certificate_number') else None) for k, v in trainer_cert_map.items()}
+    # batch.trainers is prefetched, so the ids are free; each trainer's latest certificate comes from the cache where warm
+    trainer_cert_map = _latest_certificate_numbers(t.id for t in batch.trainers.all())
 
     if request.method == 'POST':
         action = (request.POST.get('action') or '').strip().lower()
@@ -3797,7 +3903,7 @@ def smmu_request_detail(request, batch_id):
             except Exception:
                 submissions = []
 
-    beneficiaries = list(batch.beneficiaries.all())
+    beneficiaries = [bb.beneficiary for bb in batch.batch_beneficiaries.all()]
     today = date.today()
     for b in beneficiaries:
         dob = getattr(b, 'date_of_birth', None)
@@ -3955,10 +4061,8 @@ def smmu_create_partner_target(request):
     # Create or update within a transaction
     try:
         with transaction.atomic():
+            # TrainingPartnerTargets.save() runs full_clean(), so validation happens inside update_or_create
             obj, created = TrainingPartnerTargets.objects.update_or_create(defaults=defaults, **lookup)
-            # run model validation (model.clean) and save
-            obj.full_clean()
-            obj.save()
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)}, status=400)
     
@@ -3973,16 +4077,107 @@ def smmu_create_partner_target(request):
         "message": f"Target created for {partner_name}." if created else "Target updated."
     })
 
+
+def _cached_district_blocks(district_id):
+    """Blocks of a district as [{'block_id', 'block_name_en', 'is_aspirational'}] ordered by name, cached."""
+    return cache.get_or_set(
+        DISTRICT_BLOCKS_CACHE_KEY.format(district_id),
+        lambda: list(
+            Block.objects.filter(district_id=district_id)
+            .order_by("block_name_en")
+            .values("block_id", "block_name_en", "is_aspirational")
+        ),
+        REFERENCE_CACHE_TTL,
+    )
+
+
+# dmmu_dashboard filter_<key> query params -> Beneficiary lookup they filter on
+DMMU_COLUMN_FILTERS = {
+    "block": "block_name_cache",  # denormalized Block.block_name_en, as on the SMMU dashboard
+    "gram_panchayat": "gram_panchayat",
+    "village": "village",
+    "shg_name": "shg_name",
+    "social_category": "social_category",
+    "designation_in_shg_vo_clf": "designation_in_shg_vo_clf",
+    "gender": "gender",
+}
+
+
+class _SlicedPage:
+    """Minimal stand-in for a paginator Page when the row count is already known (no extra COUNT)."""
+
+    def __init__(self, object_list, number, total_rows, per_page):
+        self.object_list = object_list
+        self.number = number
+        self._total_rows = total_rows
+        self._per_page = per_page
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_previous(self):
+        return self.number > 1
+
+    def has_next(self):
+        return self.number * self._per_page < self._total_rows
+
+    def has_other_pages(self):
+        return self.has_previous() or self.has_next()
+
+    def previous_page_number(self):
+        return self.number - 1
+
+    def next_page_number(self):
+        return self.number + 1
+
+
+def _cached_count(qs, ttl=60, min_rows=1000):
+    """
+    COUNT(*) for qs, cached for `ttl` seconds under a key derived from its SQL (so every
+    search/filter combination gets its own entry). Counts below `min_rows` are cheap to
+    redo and are not cached.
+    """
+    key = "qs_count:" + hashlib.sha1(str(qs.query).encode("utf-8")).hexdigest()
+    total = cache.get(key)
+    if total is None:
+        total = qs.count()
+        if total >= min_rows:
+            cache.set(key, total, ttl)
+    return total
+
+
+def _distinct_column_values(qs, fields, ttl=300):
+    """
+    Distinct values of each column in `fields` over qs, as {field: sorted values}.
+    Runs as one UNION query (one SELECT per column, tagged with the column name) instead of a
+    separate DISTINCT sweep per column, and caches the lists for `ttl` seconds per queryset SQL.
+    """
+    base = qs.order_by()
+    key = "distinct_cols:" + hashlib.sha1((str(base.query) + "|" + ",".join(fields)).encode("utf-8")).hexdigest()
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    parts = [
+        base.annotate(_col=Value(f, output_field=CharField()), _val=F(f)).values_list("_col", "_val")
+        for f in fields
+    ]
+    out = {f: set() for f in fields}
+    for col, val in parts[0].union(*parts[1:]):
+        out[col].add(val)
+    out = {f: sorted(v for v in vals if v is not None) for f, vals in out.items()}
+    cache.set(key, out, ttl)
+    return out
+
+
 @login_required
 def dmmu_dashboard(request):
     if getattr(request.user, "role", "").lower() != "dmmu":
         return HttpResponseForbidden("🚫 Not authorized for this dashboard.")
 
-    # Charts (same as SMMU)
-    chart1 = [random.randint(0, 100) for _ in range(10)]
-    chart2 = [random.randint(0, 100) for _ in range(10)]
-    chart_labels = [f"Metric {i+1}" for i in range(10)]
-
     # Assigned district
     assigned_district = None
     try:
@@ -3993,13 +4188,9 @@ def dmmu_dashboard(request):
     except Exception:
         assigned_district = None
 
-    # Blocks dropdown (for UI)
-    blocks = list(Block.objects.filter(district=assigned_district).order_by("block_name_en")) if assigned_district else []
-
-    # aspirational blocks set
-    aspirational_blocks = set()
-    if assigned_district:
-        aspirational_blocks = set(Block.objects.filter(district=assigned_district, is_aspirational=True).values_list("block_name_en", flat=True))
+    # Blocks dropdown (for UI) and aspirational blocks set, from the per-district cache
+    blocks = _cached_district_blocks(assigned_district.district_id) if assigned_district else []
+    aspirational_blocks = {b["block_name_en"] for b in blocks if b["is_aspirational"]}
 
     # Selected block and aspirational block params from GET
     selected_block_name = request.GET.get("block_name") or None
@@ -4007,52 +4198,43 @@ def dmmu_dashboard(request):
 
     selected_block_obj = None
     if selected_block_name and assigned_district:
-        selected_block_obj = Block.objects.filter(district=assigned_district, block_name_en__iexact=selected_block_name).first()
+        wanted = selected_block_name.lower()
+        selected_block_obj = next((b for b in blocks if (b["block_name_en"] or "").lower() == wanted), None)
 
     # Build base queryset restricted to assigned district
     beneficiaries_qs = Beneficiary.objects.none()
     show_table = False
     if assigned_district:
-        beneficiaries_qs = Beneficiary.objects.filter(district=assigned_district).select_related("district", "block")
+        beneficiaries_qs = Beneficiary.objects.filter(district=assigned_district)
         show_table = True
 
     # Apply block filters (selected block OR aspirational block if provided)
     # Priority: explicit block_name (selBlock) overrides aspirational selection.
+    # Block names are matched on block_name_cache, like the search, column filters and sort
     if show_table and selected_block_obj:
-        beneficiaries_qs = beneficiaries_qs.filter(block__block_name_en__iexact=selected_block_obj.block_name_en)
+        beneficiaries_qs = beneficiaries_qs.filter(block_name_cache__iexact=selected_block_obj["block_name_en"])
     elif show_table and asp_block_name:
         # Filter by aspirational block name (only those blocks which are aspirational)
-        beneficiaries_qs = beneficiaries_qs.filter(block__block_name_en__iexact=asp_block_name, block__is_aspirational=True)
+        beneficiaries_qs = beneficiaries_qs.filter(block_name_cache__iexact=asp_block_name, block__is_aspirational=True)
 
-    # Search
-    from django.db.models import Q
+    # Search (each icontains is backed by a pg_trgm index, see migrations 0024/0025)
     q = request.GET.get("search", "").strip()
     if q and show_table:
         qobj = Q()
-        qobj |= Q(block__block_name_en__icontains=q)
+        qobj |= Q(block_name_cache__icontains=q)  # denormalized Block.block_name_en, avoids the join
         qobj |= Q(shg_name__icontains=q)
         qobj |= Q(gram_panchayat__icontains=q)
         qobj |= Q(village__icontains=q)
         beneficiaries_qs = beneficiaries_qs.filter(qobj)
 
-    # Column filters
-    ALLOWED_FILTERS = {
-        "block", "gram_panchayat", "village", "shg_name",
-        "social_category", "designation_in_shg_vo_clf", "gender"
-    }
-    for key, val in request.GET.items():
-        if not key.startswith("filter_") or not val:
-            continue
-        fld = key.replace("filter_", "")
-        if fld not in ALLOWED_FILTERS:
-            continue
-        vals = [v.strip() for v in val.split(",") if v.strip()]
-        if not vals:
-            continue
-        if fld == "block":
-            beneficiaries_qs = beneficiaries_qs.filter(block__block_name_en__in=vals)
-        else:
-            beneficiaries_qs = beneficiaries_qs.filter(**{f"{fld}__in": vals})
+    # Column filters: AND every filter_<field> into one Q and apply it with a single filter()
+    column_filters = Q()
+    for fld, lookup in DMMU_COLUMN_FILTERS.items():
+        vals = [v.strip() for v in (request.GET.get(f"filter_{fld}") or "").split(",") if v.strip()]
+        if vals:
+            column_filters &= Q(**{f"{lookup}__in": vals})
+    if column_filters:
+        beneficiaries_qs = beneficiaries_qs.filter(column_filters)
 
     # Sorting
     sort_by = request.GET.get("sort_by", "")
@@ -4064,14 +4246,14 @@ def dmmu_dashboard(request):
     if sort_by in allowed_sort_fields:
         sort_field = sort_by
         if sort_by == "block":
-            sort_field = "block__block_name_en"
+            sort_field = "block_name_cache"
         beneficiaries_qs = beneficiaries_qs.order_by(f"-{sort_field}" if order == "desc" else sort_field)
     else:
         beneficiaries_qs = beneficiaries_qs.order_by("id")
 
     # === Pagination: explicit total_rows & total_pages (no artificial cap) ===
     per_page = 20  # change if needed
-    total_rows = beneficiaries_qs.count() if show_table else 0
+    total_rows = _cached_count(beneficiaries_qs) if show_table else 0
     import math
     total_pages = math.ceil(total_rows / per_page) if total_rows else 1
 
@@ -4086,9 +4268,13 @@ def dmmu_dashboard(request):
     if requested_page > total_pages:
         requested_page = total_pages
 
-    # build paginator and get page
-    paginator = Paginator(beneficiaries_qs, per_page) if show_table else None
-    page_obj = paginator.get_page(requested_page) if paginator else []
+    # slice the page directly (only the columns the table renders); total_rows is already known,
+    # so a Paginator would only repeat the COUNT
+    page_obj = []
+    if show_table:
+        offset = (requested_page - 1) * per_page
+        page_rows = list(beneficiaries_qs.only(*BENEFICIARY_TABLE_FIELDS)[offset:offset + per_page])
+        page_obj = _SlicedPage(page_rows, requested_page, total_rows, per_page)
 
     # page window for template (show +-5 pages)
     window = 5
@@ -4100,13 +4286,16 @@ def dmmu_dashboard(request):
         return [v for v in vals if v is not None and str(v).strip() != ""]
 
     if assigned_district:
-        blocks_for_district = list(Block.objects.filter(district=assigned_district).order_by("block_name_en").values_list("block_name_en", flat=True).distinct())
-        gp_vals = list(beneficiaries_qs.order_by("gram_panchayat").values_list("gram_panchayat", flat=True).distinct())
-        village_vals = list(beneficiaries_qs.order_by("village").values_list("village", flat=True).distinct())
-        shg_vals = list(beneficiaries_qs.order_by("shg_name").values_list("shg_name", flat=True).distinct())
-        social_vals = list(beneficiaries_qs.order_by("social_category").values_list("social_category", flat=True).distinct())
-        desig_vals = list(beneficiaries_qs.order_by("designation_in_shg_vo_clf").values_list("designation_in_shg_vo_clf", flat=True).distinct())
-        gender_vals = list(beneficiaries_qs.order_by("gender").values_list("gender", flat=True).distinct())
+        blocks_for_district = list(dict.fromkeys(b["block_name_en"] for b in blocks))
+        col_vals = _distinct_column_values(beneficiaries_qs, (
+            "gram_panchayat", "village", "shg_name", "social_category", "designation_in_shg_vo_clf", "gender",
+        ))
+        gp_vals = col_vals["gram_panchayat"]
+        village_vals = col_vals["village"]
+        shg_vals = col_vals["shg_name"]
+        social_vals = col_vals["social_category"]
+        desig_vals = col_vals["designation_in_shg_vo_clf"]
+        gender_vals = col_vals["gender"]
     else:
         blocks_for_district = []
         gp_vals = village_vals = shg_vals = social_vals = desig_vals = gender_vals = []
@@ -4127,17 +4316,24 @@ def dmmu_dashboard(request):
     plan_ids = list(plans_qs.values_list('id', flat=True))
     batches_map = {}
     if plan_ids:
-        batches = Batch.objects.filter(training_plan_id__in=plan_ids).order_by('-start_date')
+        # batches reach their plan through the request; plain rows, one query, no per-batch plan lookup
+        batches = (
+            Batch.objects.filter(request__training_plan_id__in=plan_ids)
+            .order_by('-start_date')
+            .values('id', 'code', 'request__training_plan_id', 'request__training_plan__training_name',
+                    'start_date', 'end_date', 'status', 'centre_id', 'created_at')
+            .iterator(chunk_size=500)
+        )
         for b in batches:
-            batches_map.setdefault(b.training_plan_id, []).append({
-                'id': b.id,
-                'code': b.code or f"Batch-{b.id}",
-                'title': getattr(b.training_plan, 'training_name', '') if getattr(b, 'training_plan', None) else '',
-                'start_date': b.start_date,
-                'end_date': b.end_date,
-                'status': b.status,
-                'centre_proposed': b.centre_proposed,
-                'created_at': b.created_at,
+            batches_map.setdefault(b['request__training_plan_id'], []).append({
+                'id': b['id'],
+                'code': b['code'] or f"Batch-{b['id']}",
+                'title': b['request__training_plan__training_name'] or '',
+                'start_date': b['start_date'],
+                'end_date': b['end_date'],
+                'status': b['status'],
+                'centre_id': b['centre_id'],
+                'created_at': b['created_at'],
             })
 
     plans_list = []
@@ -4151,21 +4347,14 @@ def dmmu_dashboard(request):
         })
 
     assigned_district_short = getattr(assigned_district, "district_name_en", None) if assigned_district else None
-    selected_block_for_ctx = selected_block_obj.block_name_en if selected_block_obj else None
+    selected_block_for_ctx = selected_block_obj["block_name_en"] if selected_block_obj else None
 
     context = {
-        "chart1": chart1,
-        "chart2": chart2,
-        "chart_labels": chart_labels,
-        "chart1_json": json.dumps(chart1),
-        "chart2_json": json.dumps(chart2),
-        "chart_labels_json": json.dumps(chart_labels),
         "blocks": blocks,
         "assigned_district": assigned_district_short,
         "aspirational_blocks": list(aspirational_blocks),
         "selected_block": selected_block_for_ctx,
         "page_obj": page_obj,
-        "paginator": paginator,
         "show_table": show_table,
         "groupable_values": groupable_values,
         "groupable_values_json": json.dumps(groupable_values, default=str),
@@ -4193,6 +4382,28 @@ def dmmu_dashboard(request):
     default_content = render_to_string("dmmu/dmmu_dashboard.html", context, request=request)
     return render(request, "dashboard.html", {"user": request.user, "default_content": default_content})
 
+
+# Upper bound on trainers listed in each batch's picker on dmmu_request_detail
+MASTER_TRAINER_PICKER_LIMIT = 500
+
+# Closure fragments of COMPLETED requests are cached (evicted when what they show is saved, see
+# models.REQUEST_CLOSURE_CACHE_KEY); the short TTL bounds what no signal covers, e.g. the creator's name
+REQUEST_CLOSURE_CACHE_TTL = 10 * 60
+CSRF_TOKEN_PLACEHOLDER = '__CSRF_TOKEN__'
+
+# Batch and centre columns read by dmmu_request_detail (batch header + centre_info)
+DMMU_REQUEST_BATCH_FIELDS = (
+    "id", "code", "status", "start_date", "end_date", "request_id",
+    "centre__serial_number", "centre__district", "centre__centre_coord_name",
+    "centre__centre_coord_mob_number", "centre__venue_name", "centre__venue_address",
+    "centre__training_hall_count", "centre__training_hall_capacity", "centre__security_arrangements",
+    "centre__toilets_bathrooms", "centre__power_water_facility", "centre__medical_kit",
+    "centre__centre_type", "centre__open_space", "centre__field_visit_facility",
+    "centre__transport_facility", "centre__dining_facility", "centre__other_details",
+    "centre__created_at",
+)
+
+
 @login_required
 def dmmu_training_requests(request):
     if getattr(request.user, 'role', '').lower() != 'dmmu':
@@ -4208,53 +4419,35 @@ def dmmu_training_requests(request):
 
     qs = TrainingRequest.objects.none()
 
-    try:
-        if assigned_district:
-            # Find BMMU users under this district
-            try:
-                block_assigns = BmmuBlockAssignment.objects.filter(
-                    block__district=assigned_district
-                ).values_list('user_id', flat=True)
-                user_ids = list(block_assigns)
-                qs_block = (
-                    TrainingRequest.objects.filter(level__iexact='BLOCK', created_by_id__in=user_ids)
-                    if user_ids else TrainingRequest.objects.none()
-                )
-            except Exception:
-                qs_block = TrainingRequest.objects.none()
+    # Read and normalize status filter
+    requested_status = (request.GET.get('status') or '').strip().upper()
 
-            # Requests directly tied to this district
-            try:
-                qs_other = TrainingRequest.objects.filter(district=assigned_district)
-            except Exception:
-                qs_other = TrainingRequest.objects.none()
-        else:
-            qs_block = TrainingRequest.objects.none()
-            qs_other = TrainingRequest.objects.none()
-
-        qs = (qs_block | qs_other).distinct().order_by('-created_at')
-
-        # Read and normalize status filter
-        requested_status = (request.GET.get('status') or '').strip().upper()
+    # No district assigned => nothing to list, so skip building any queryset
+    if assigned_district:
+        try:
+            # BLOCK-level requests raised by BMMU users assigned to blocks in this district;
+            # the assignment lookup runs as a subquery, so no id list round-trip and no DISTINCT
+            bmmu_users = BmmuBlockAssignment.objects.filter(block__district=assigned_district).values('user_id')
+            qs = (
+                TrainingRequest.objects.filter(level__iexact='BLOCK', created_by__in=bmmu_users)
+                .select_related('training_plan')
+                .order_by('-created_at')
+            )
 
-        # Allowed statuses from model
-        VALID_STATUSES = [c[0].upper() for c in getattr(TrainingRequest, 'STATUS_CHOICES', [])]
+            # Allowed statuses from model
+            VALID_STATUSES = [c[0].upper() for c in getattr(TrainingRequest, 'STATUS_CHOICES', [])]
 
-        # Apply filter if provided
-        if requested_status:
-            if requested_status in VALID_STATUSES:
-                qs = qs.filter(status__iexact=requested_status)
-            else:
-                # Invalid filter → empty queryset
-                qs = TrainingRequest.objects.none()
-        else:
-            # Only apply fallback if no filter AND no data
-            if not qs.exists():
-                qs = TrainingRequest.objects.filter(level__iexact='BLOCK').order_by('-created_at')[:200]
+            # Apply filter if provided
+            if requested_status:
+                if requested_status in VALID_STATUSES:
+                    qs = qs.filter(status__iexact=requested_status)
+                else:
+                    # Invalid filter → empty queryset
+                    qs = TrainingRequest.objects.none()
 
-    except Exception as e:
-        logger.exception("dmmu_training_requests: unexpected error building queryset: %s", e)
-        qs = TrainingRequest.objects.none()
+        except Exception as e:
+            logger.exception("dmmu_training_requests: unexpected error building queryset: %s", e)
+            qs = TrainingRequest.objects.none()
 
     # Prepare dropdown options (add "All" on top)
     status_choices = [('', 'All')] + list(getattr(TrainingRequest, 'STATUS_CHOICES', []))
@@ -4291,6 +4484,8 @@ def dmmu_request_detail(request, request_id):
     if getattr(request.user, 'role', '').lower() != 'dmmu':
         return HttpResponseForbidden("Not authorized")
 
+    today = _india_today()
+
     # safe fetch training request
     tr = get_object_or_404(
         TrainingRequest.objects.select_related('training_plan', 'partner'),
@@ -4333,74 +4528,39 @@ def dmmu_request_detail(request, request_id):
         action = (request.POST.get('action') or '').strip().lower()
 
         # assign trainers to batches (multi-checkbox allowed)
-        for b in Batch.objects.filter(request=tr):
-            key = f"trainer_for_batch_{b.id}"
-            posted_ids = request.POST.getlist(key) or []
-
-            try:
-                # Delete previous participations for this batch (safe)
+        batches = list(Batch.objects.filter(request=tr).only('id'))
+        posted_by_batch = {}
+        for b in batches:
+            tids = []
+            for tid in request.POST.getlist(f"trainer_for_batch_{b.id}") or []:
                 try:
-                    TrainerBatchParticipation.objects.filter(batch=b).delete()
+                    tids.append(int(tid))
                 except Exception:
-                    # fallback: if batch exposes m2m trainers, clear it
-                    try:
-                        if hasattr(b, 'trainers'):
-                            b.trainers.clear()
-                    except Exception:
-                        pass
-
-                # Create new TrainerBatchParticipation rows for each posted id
-                for tid in [x for x in posted_ids if x]:
-                    try:
-                        tid_int = int(tid)
-                    except Exception:
-                        continue
-
-                    trainer_obj = None
-                    # prefer MasterTrainer model
-                    try:
-                        trainer_obj = MasterTrainer.objects.filter(id=tid_int).first()
-                    except Exception:
-                        trainer_obj = None
+                    continue
+            posted_by_batch[b.id] = list(dict.fromkeys(tids))
 
-                    if not trainer_obj:
-                        # fallback: check User, then try to match to MasterTrainer via user FK if your MasterTrainer links to user
-                        try:
-                            trainer_user = User.objects.filter(id=tid_int).first()
-                            if trainer_user:
-                                # try to find MasterTrainer for this user
-                                try:
-                                    trainer_obj = MasterTrainer.objects.filter(user=trainer_user).first()
-                                except Exception:
-                                    trainer_obj = None
-                                # if still None, we may add user to m2m (if available)
-                                if not trainer_obj and hasattr(b, 'trainers'):
-                                    try:
-                                        b.trainers.add(trainer_user)
-                                    except Exception:
-                                        pass
-                        except Exception:
-                            pass
+        # resolve every posted id in one go: MasterTrainer ids, else User ids linked to a MasterTrainer
+        all_tids = {tid for tids in posted_by_batch.values() for tid in tids}
+        trainer_ids = set(MasterTrainer.objects.filter(id__in=all_tids).values_list('id', flat=True)) if all_tids else set()
+        trainer_by_user = dict(
+            MasterTrainer.objects.filter(user_id__in=all_tids - trainer_ids).values_list('user_id', 'id')
+        ) if all_tids - trainer_ids else {}
 
-                    if trainer_obj:
-                        try:
-                            TrainerBatchParticipation.objects.create(batch=b, trainer=trainer_obj, participated=False)
-                        except Exception:
-                            # fallback to m2m add if available
-                            try:
-                                if hasattr(b, 'trainers'):
-                                    b.trainers.add(trainer_obj)
-                            except Exception:
-                                logger.exception("dmmu_request_detail: failed to add trainer (fallback) %s to batch %s", tid_int, b.id)
-            except Exception:
-                logger.exception("dmmu_request_detail: failed processing posted trainers for batch %s", b.id)
+        new_rows = []
+        for b in batches:
+            resolved = [tid if tid in trainer_ids else trainer_by_user.get(tid) for tid in posted_by_batch[b.id]]
+            for trainer_id in dict.fromkeys(t for t in resolved if t):
+                new_rows.append(TrainerBatchParticipation(batch_id=b.id, trainer_id=trainer_id, participated=False))
 
-        # Approve all => set request.status and all batches.status
         try:
-            india_tz = ZoneInfo("Asia/Kolkata")
+            with transaction.atomic():
+                # Delete previous participations in one statement, then insert the posted set in one statement
+                TrainerBatchParticipation.objects.filter(batch_id__in=[b.id for b in batches]).delete()
+                TrainerBatchParticipation.objects.bulk_create(new_rows, batch_size=500)
         except Exception:
-            india_tz = None
-        today = datetime.now(tz=india_tz).date() if india_tz else timezone.localdate()
+            logger.exception("dmmu_request_detail: failed to save trainer assignments for request %s", tr.id)
+
+        # Approve all => set request.status and all batches.status
         if action == 'approve_all':
             try:
                 if hasattr(tr, 'status'):
@@ -4447,75 +4607,76 @@ def dmmu_request_detail(request, request_id):
 
     # GET: prepare display data
 
+    # A COMPLETED request only shows the closure fragment, cached per request; the csrf tokens in
+    # its forms are per-user, so they are stored as a placeholder and filled in on every hit
+    is_completed = (getattr(tr, 'status', '') or '').upper() == 'COMPLETED'
+    closure_cache_key = REQUEST_CLOSURE_CACHE_KEY.format(tr.id)
+    if is_completed:
+        cached_closure = cache.get(closure_cache_key)
+        if cached_closure is not None:
+            fragment_html = cached_closure.replace(CSRF_TOKEN_PLACEHOLDER, get_token(request))
+            if request.headers.get("x-requested-with") == "XMLHttpRequest":
+                return HttpResponse(fragment_html)
+            return render(request, 'dashboard.html', {'user': request.user, 'default_content': fragment_html})
+
     # Retrieve batches for this request
-    batches_qs = Batch.objects.filter(request=tr).select_related('centre').order_by('start_date', 'id')
+    # rooms / submissions / beneficiaries / trainer ids are read per batch below: prefetch them all up front
+    batches_qs = (
+        Batch.objects.filter(request=tr)
+        .select_related('centre', 'centre__district')
+        .only(*DMMU_REQUEST_BATCH_FIELDS)
+        .prefetch_related(
+            'centre__rooms',
+            'centre__submissions',
+            # request_detail.html prints each beneficiary's block in the Location column
+            Prefetch('batch_beneficiaries', queryset=BatchBeneficiary.objects.select_related('beneficiary__block')),
+            Prefetch(
+                'trainerparticipations',
+                queryset=TrainerBatchParticipation.objects.only('id', 'trainer_id', 'batch_id'),
+                to_attr='_tbp_cache',
+            ),
+        )
+        .order_by('start_date', 'id')
+    )
 
     batch_details = []
     for b in batches_qs:
         centre = getattr(b, 'centre', None)
 
-        # rooms and submissions
-        rooms = []
-        submissions = []
-        try:
-            if centre and hasattr(centre, 'rooms'):
-                rooms = list(centre.rooms.all())
-        except Exception:
-            rooms = []
-        try:
-            if centre and hasattr(centre, 'submissions'):
-                submissions = list(centre.submissions.all())
-        except Exception:
-            submissions = []
+        # rooms and submissions (prefetched above; only a missing centre needs guarding)
+        rooms = list(centre.rooms.all()) if centre else []
+        submissions = list(centre.submissions.all()) if centre else []
 
-        # beneficiaries assigned for this batch: prefer BatchBeneficiary join model
-        beneficiaries = []
-        try:
-            if hasattr(b, 'batch_beneficiaries'):
-                beneficiaries = [bb.beneficiary for bb in b.batch_beneficiaries.select_related('beneficiary').all()]
-            elif hasattr(b, 'beneficiaries'):
-                beneficiaries = list(b.beneficiaries.all())
-        except Exception:
-            beneficiaries = []
+        # beneficiaries assigned for this batch via the BatchBeneficiary join model (prefetched)
+        beneficiaries = [bb.beneficiary for bb in b.batch_beneficiaries.all()]
 
-        # assigned trainer ids for pre-check in template
-        assigned_trainer_ids = []
-        try:
-            assigned_trainer_ids = list(TrainerBatchParticipation.objects.filter(batch=b).values_list('trainer_id', flat=True))
-        except Exception:
-            try:
-                if hasattr(b, 'trainers'):
-                    assigned_trainer_ids = list(b.trainers.values_list('id', flat=True))
-            except Exception:
-                assigned_trainer_ids = []
+        # assigned trainer ids for pre-check in template (prefetched TrainerBatchParticipation rows)
+        assigned_trainer_ids = [x.trainer_id for x in b._tbp_cache]
 
         # enriched centre_info dict for template
         centre_info = {}
         if centre:
-            try:
-                centre_info = {
-                    'serial_number': getattr(centre, 'serial_number', None),
-                    'district': getattr(centre, 'district', None),
-                    'coord_name': getattr(centre, 'centre_coord_name', None),
-                    'coord_mobile': getattr(centre, 'centre_coord_mob_number', None),
-                    'venue_name': getattr(centre, 'venue_name', None),
-                    'venue_address': getattr(centre, 'venue_address', None),
-                    'training_hall_count': getattr(centre, 'training_hall_count', None),
-                    'training_hall_capacity': getattr(centre, 'training_hall_capacity', None),
-                    'security_arrangements': getattr(centre, 'security_arrangements', None),
-                    'toilets_bathrooms': getattr(centre, 'toilets_bathrooms', None),
-                    'power_water_facility': getattr(centre, 'power_water_facility', None),
-                    'medical_kit': getattr(centre, 'medical_kit', None),
-                    'centre_type': getattr(centre, 'centre_type', None),
-                    'open_space': getattr(centre, 'open_space', None),
-                    'field_visit_facility': getattr(centre, 'field_visit_facility', None),
-                    'transport_facility': getattr(centre, 'transport_facility', None),
-                    'dining_facility': getattr(centre, 'dining_facility', None),
-                    'other_details': getattr(centre, 'other_details', None),
-                    'created_at': getattr(centre, 'created_at', None),
-                }
-            except Exception:
-                centre_info = {}
+            centre_info = {
+                'serial_number': centre.serial_number,
+                'district': centre.district,
+                'coord_name': centre.centre_coord_name,
+                'coord_mobile': centre.centre_coord_mob_number,
+                'venue_name': centre.venue_name,
+                'venue_address': centre.venue_address,
+                'training_hall_count': centre.training_hall_count,
+                'training_hall_capacity': centre.training_hall_capacity,
+                'security_arrangements': centre.security_arrangements,
+                'toilets_bathrooms': centre.toilets_bathrooms,
+                'power_water_facility': centre.power_water_facility,
+                'medical_kit': centre.medical_kit,
+                'centre_type': centre.centre_type,
+                'open_space': centre.open_space,
+                'field_visit_facility': centre.field_visit_facility,
+                'transport_facility': centre.transport_facility,
+                'dining_facility': centre.dining_facility,
+                'other_details': centre.other_details,
+                'created_at': centre.created_at,
+            }
 
         batch_details.append({
             'batch': b,
@@ -4527,52 +4688,6 @@ def dmmu_request_detail(request, request_id):
             'assigned_trainer_ids': assigned_trainer_ids,
         })
 
-    # Participants attached to the TrainingRequest
-    participants = []
-    try:
-        participants = list(tr.beneficiaries.all())
-    except Exception:
-        participants = []
-
-    # compute participant helpers (display_name, display_mobile, display_location, age)
-    
-    try:
-        india_tz = ZoneInfo("Asia/Kolkata")
-    except Exception:
-        india_tz = None
-    today = datetime.now(tz=india_tz).date() if india_tz else timezone.localdate()
-    
-    for p in participants:
-        dob = getattr(p, 'date_of_birth', None)
-        age = None
-        if dob:
-            try:
-                age = today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
-            except Exception:
-                age = None
-        setattr(p, 'age', age)
-
-        display_name = getattr(p, 'member_name', None) or getattr(p, 'full_name', None) or getattr(p, 'member_code', None) or str(p)
-        setattr(p, 'display_name', display_name)
-
-        mobile = getattr(p, 'mobile_number', None) or getattr(p, 'mobile_no', None) or getattr(p, 'mobile', None) or ''
-        setattr(p, 'display_mobile', mobile)
-
-        loc_parts = []
-        try:
-            v = getattr(p, 'village', None)
-            if v:
-                loc_parts.append(str(v))
-            b = getattr(p, 'block', None)
-            if b:
-                try:
-                    loc_parts.append(getattr(b, 'block_name_en', str(b)))
-                except Exception:
-                    loc_parts.append(str(b))
-        except Exception:
-            pass
-        setattr(p, 'display_location', ", ".join([x for x in loc_parts if x]))
-
     # Determine designation token mapping for master trainers
     trainer_role_token = 'DRP'
     try:
@@ -4586,46 +4701,85 @@ def dmmu_request_detail(request, request_id):
     except Exception:
         trainer_role_token = 'DRP'
 
-    # Fetch master trainers (prefer MasterTrainer model)
+    # Fetch master trainers (prefer MasterTrainer model): every trainer is offered, as before. Above
+    # MASTER_TRAINER_PICKER_LIMIT the list is capped, keeping trainers already assigned here (so the
+    # cap never un-assigns them) and then this level's designation; the template says when it cut.
+    assigned_ids = {tid for item in batch_details for tid in item['assigned_trainer_ids']}
+    # each trainer's latest certificate number rides along as latest_cert_number (no separate cert query)
+    latest_cert_number = (
+        MasterTrainerCertificate.objects.filter(trainer_id=OuterRef('pk'))
+        .order_by(*LATEST_CERTIFICATE_ORDERING)
+        .values('certificate_number')[:1]
+    )
     master_trainers = []
+    master_trainers_truncated = False
     try:
-        master_trainers = MasterTrainer.objects.all()
+        master_trainers = list(
+            MasterTrainer.objects.only('id', 'full_name', 'success_rate', 'mobile_no')
+            .annotate(latest_cert_number=Subquery(latest_cert_number))
+            .alias(
+                _assigned_first=Case(When(id__in=assigned_ids, then=Value(0)), default=Value(1), output_field=IntegerField()),
+                _level_first=Case(When(designation__iexact=trainer_role_token, then=Value(0)), default=Value(1), output_field=IntegerField()),
+            )
+            .order_by('_assigned_first', '_level_first', 'id')[:MASTER_TRAINER_PICKER_LIMIT + 1]
+        )
+        master_trainers_truncated = len(master_trainers) > MASTER_TRAINER_PICKER_LIMIT
+        # the priority order only decides who survives the cap; the picker lists them by id, as before
+        master_trainers = sorted(master_trainers[:MASTER_TRAINER_PICKER_LIMIT], key=lambda mt: mt.id)
     except Exception:
         try:
             master_trainers = list(User.objects.filter(designation__iexact=trainer_role_token).order_by('success_rate'))
         except Exception:
             master_trainers = []
 
-    # Build trainer_cert_map
-    trainer_cert_map = {}
-    try:
-        trainer_ids = [getattr(mt, 'id') for mt in master_trainers if getattr(mt, 'id', None)]
-        if trainer_ids:
-            certs = MasterTrainerCertificate.objects.filter(trainer_id__in=trainer_ids).order_by('trainer_id', '-issued_on', '-created_at')
-            for c in certs:
-                if c.trainer_id not in trainer_cert_map:
-                    trainer_cert_map[c.trainer_id] = c.certificate_number
-    except Exception:
-        trainer_cert_map = {}   
-       
-    if (getattr(tr, 'status', '') or '').upper() == 'COMPLETED':
+    if is_completed:
         # render a closure screen listing batches (clickable rows)
         fragment_html = render_to_string('dmmu/request_closure.html', {
             'training_request': tr,
             'batches': batch_details,
-        }, request=request)
+            'csrf_token': CSRF_TOKEN_PLACEHOLDER,
+        })
+        cache.set(closure_cache_key, fragment_html, REQUEST_CLOSURE_CACHE_TTL)
+        fragment_html = fragment_html.replace(CSRF_TOKEN_PLACEHOLDER, get_token(request))
     else:
         fragment_html = render_to_string('dmmu/request_detail.html', {
             'training_request': tr,
             'batches': batch_details,
-            'participants': participants,
             'master_trainers': master_trainers,
-            'trainer_cert_map': trainer_cert_map,
+            'master_trainers_truncated': master_trainers_truncated,
+            'master_trainer_limit': MASTER_TRAINER_PICKER_LIMIT,
             'today': today,          
         }, request=request)
 
+    # AJAX navigation from the dashboard already has the shell loaded: send the fragment alone
+    if request.headers.get("x-requested-with") == "XMLHttpRequest":
+        return HttpResponse(fragment_html)
+
     return render(request, 'dashboard.html', {'user': request.user, 'default_content': fragment_html})
 
+def _fragment_json_response(html):
+    """{'ok': True, 'html': html} as JSON; orjson (when installed) encodes the large HTML string in C, as raw UTF-8."""
+    if orjson is not None:
+        return HttpResponse(orjson.dumps({'ok': True, 'html': html}), content_type='application/json')
+    return JsonResponse({'ok': True, 'html': html})
+
+
+# Batch / request / centre columns read by dmmu_batch_detail_ajax and its modal template
+DMMU_BATCH_MODAL_FIELDS = (
+    'id', 'code', 'status', 'start_date', 'end_date', 'centre_id',
+    'request__id', 'request__training_plan__training_name', 'request__partner__name',
+)
+
+# centre_info key -> centre column, read as plain values on the batch row (no Centre instance)
+DMMU_BATCH_MODAL_CENTRE_FIELDS = {
+    'venue_name': 'centre__venue_name',
+    'venue_address': 'centre__venue_address',
+    'serial_number': 'centre__serial_number',
+    'coord_name': 'centre__centre_coord_name',
+    'coord_mobile': 'centre__centre_coord_mob_number',
+}
+
+
 @login_required
 @require_http_methods(["GET"])
 def dmmu_batch_detail_ajax(request, batch_id):
@@ -4639,83 +4793,55 @@ def dmmu_batch_detail_ajax(request, batch_id):
         return HttpResponseForbidden("Not authorized")
 
     try:
-        b = Batch.objects.select_related('request__training_plan', 'centre')\
+        b = Batch.objects.select_related('request__training_plan', 'request__partner')\
+            .only(*DMMU_BATCH_MODAL_FIELDS)\
+            .annotate(**{f'_centre_{key}': F(col) for key, col in DMMU_BATCH_MODAL_CENTRE_FIELDS.items()})\
             .prefetch_related(
-                'batch_beneficiaries__beneficiary',
-                'trainerparticipations__trainer',
-                'attendances__participant_records'
-            ).get(id=batch_id)
-    except Batch.DoesNotExist:
-        return JsonResponse({'ok': False, 'error': 'Batch not found'}, status=404)
+                Prefetch('batch_beneficiaries', queryset=BatchBeneficiary.objects.select_related('beneficiary')),
+                Prefetch('trainerparticipations', queryset=TrainerBatchParticipation.objects.select_related('trainer')),
+                # dates only, already ordered; the modal loads participant rows per date via AJAX
+                Prefetch('attendances', queryset=BatchAttendance.objects.only('id', 'batch_id', 'date').order_by('date')),
+            ).filter(id=batch_id).first()
     except Exception as e:
         logger.exception("dmmu_batch_detail_ajax: DB error fetching batch %s: %s", batch_id, e)
         return JsonResponse({'ok': False, 'error': 'Server error fetching batch'}, status=500)
+    # a guessed / stale id is an ordinary miss, not an exception
+    if b is None:
+        return JsonResponse({'ok': False, 'error': 'Batch not found'}, status=404)
 
+    # one guard for the whole build: a missing prefetch or bad query surfaces in the log instead of
+    # silently rendering empty sections
     try:
-        # beneficiaries
-        try:
-            beneficiaries = [bb.beneficiary for bb in b.batch_beneficiaries.select_related('beneficiary').all()]
-        except Exception:
-            beneficiaries = []
+        # beneficiaries (prefetch cache, beneficiary already joined; select_related() here would re-query)
+        beneficiaries = [bb.beneficiary for bb in b.batch_beneficiaries.all()]
 
         # trainers: prefer TrainerBatchParticipation -> trainer FK
-        trainers = []
-        try:
-            trainers = [tp.trainer for tp in b.trainerparticipations.select_related('trainer').all()]
-        except Exception:
-            trainers = []
+        trainers = [tp.trainer for tp in b.trainerparticipations.all()]
 
         # fallback: look for trainers recorded as eKYC participant_role='Trainer'
         if not trainers:
-            try:
-                ek_trainer_ids = list(BatchEkycVerification.objects.filter(batch=b, participant_role__iexact='trainer')
-                                       .values_list('participant_id', flat=True))
-                # filter unique and fetch MasterTrainer by id; fallback to User
-                ek_trainer_ids = list(dict.fromkeys([int(x) for x in ek_trainer_ids if x is not None]))
-                if ek_trainer_ids:
-                    # try MasterTrainer model
-                    try:
-                        trainers = list(MasterTrainer.objects.filter(id__in=ek_trainer_ids))
-                    except Exception:
-                        trainers = []
-                    # If still empty, try to look up User objects (some setups use user IDs)
-                    if not trainers:
-                        try:
-                            users = list(User.objects.filter(id__in=ek_trainer_ids))
-                            # convert User -> minimal objects with desirable attrs if necessary
-                            trainers = []
-                            for u in users:
-                                # create a lightweight wrapper-like object if MasterTrainer not present
-                                # but template expects 'full_name' and 'mobile_no' etc.
-                                u.full_name = getattr(u, 'get_full_name', lambda: getattr(u, 'username', str(u)))()
-                                u.mobile_no = getattr(u, 'mobile_number', None) or getattr(u, 'mobile', None) or getattr(u, 'phone', None)
-                                trainers.append(u)
-                        except Exception:
-                            trainers = trainers or []
-            except Exception:
-                trainers = trainers or []
+            # eKYC trainer ids stay a subquery: the DB resolves MasterTrainer (or User) rows in one SELECT;
+            # IN (...) already collapses repeated ids, so no .distinct() / Python dedup is needed
+            ek_trainer_ids = BatchEkycVerification.objects.filter(batch=b, participant_role__iexact='trainer').values('participant_id')
+            trainers = list(MasterTrainer.objects.filter(id__in=ek_trainer_ids))
+            # If still empty, try to look up User objects (some setups use user IDs)
+            if not trainers:
+                # template expects 'full_name' and 'mobile_no' on each trainer: computed in SQL
+                # (User has no mobile column, so mobile_no is always empty)
+                trainers = list(
+                    User.objects.filter(id__in=ek_trainer_ids).annotate(
+                        full_name=Trim(Concat('first_name', Value(' '), 'last_name')),
+                        mobile_no=Value(None, output_field=CharField()),
+                    )
+                )
 
-        # attendance dates
-        attendance_dates = []
-        try:
-            attendance_dates = list(b.attendances.order_by('date').values_list('date', flat=True))
-        except Exception:
-            attendance_dates = []
+        # attendance dates (ordered prefetch)
+        attendance_dates = [a.date for a in b.attendances.all()]
 
-        # centre_info
+        # centre_info (annotated onto the batch row above)
         centre_info = {}
-        try:
-            c = b.centre
-            if c:
-                centre_info = {
-                    'venue_name': getattr(c, 'venue_name', None),
-                    'venue_address': getattr(c, 'venue_address', None),
-                    'serial_number': getattr(c, 'serial_number', None),
-                    'coord_name': getattr(c, 'centre_coord_name', None),
-                    'coord_mobile': getattr(c, 'centre_coord_mob_number', None),
-                }
-        except Exception:
-            centre_info = {}
+        if b.centre_id:
+            centre_info = {key: getattr(b, f'_centre_{key}') for key in DMMU_BATCH_MODAL_CENTRE_FIELDS}
 
         html = render_to_string('dmmu/partials/batch_detail_modal.html', {
             'batch': b,
@@ -4726,7 +4852,7 @@ def dmmu_batch_detail_ajax(request, batch_id):
             'request_obj': getattr(b, 'request', None),
         }, request=request)
 
-        return JsonResponse({'ok': True, 'html': html})
+        return _fragment_json_response(html)
     except Exception as e:
         logger.exception("dmmu_batch_detail_ajax: render error for batch %s: %s", batch_id, e)
         return JsonResponse({'ok': False, 'error': 'Server error rendering batch details'}, status=500)
@@ -4734,81 +4860,26 @@ def dmmu_batch_detail_ajax(request, batch_id):
     
 @login_required
 @require_http_methods(["GET"])
-def dmmu_batch_attendance_date(request, batch_id, date_str):
+def dmmu_batch_attendance_date(request, batch_id, the_date):
     """
-    date_str expected 'YYYY-MM-DD' but accept several common variants.
+    the_date arrives as a datetime.date: the <isodate:...> converter only matches YYYY-MM-DD
+    (anything else 404s at URL dispatch), so no parsing is needed here.
     Returns JSON { ok: True, html: "..." } or { ok: False, error: "..." }.
     """
     if getattr(request.user, 'role', '').lower() != 'dmmu':
         return HttpResponseForbidden("Not authorized")
 
-    # defensive: decode URL-encoded parts and strip whitespace
     try:
-        raw = unquote(str(date_str or '')).strip()
-    except Exception:
-        raw = (date_str or '').strip()
-
-    the_date = None
-
-    # Try common formats in order
-    parse_attempts = [
-        "%Y-%m-%d",            # 2025-10-04
-        "%Y-%m-%dT%H:%M:%S",   # 2025-10-04T00:00:00
-        "%d-%m-%Y",            # 04-10-2025
-        "%d/%m/%Y",            # 04/10/2025
-        "%b %d, %Y",           # Oct 04, 2025
-        "%b. %d, %Y",          # Oct. 4, 2025
-        "%B %d, %Y",           # October 4, 2025
-    ]
-
-    for fmt in parse_attempts:
-        try:
-            the_date = datetime.datetime.strptime(raw, fmt).date()
-            break
-        except Exception:
-            continue
-
-    if the_date is None:
-        # Try isoformat parse (handles many ISO variants), or fallback to dateutil if available
-        try:
-            # try to handle trailing milliseconds or timezone (basic)
-            if 'T' in raw and raw.endswith('Z'):
-                # normalize Z timezone
-                raw_norm = raw.replace('Z', '+00:00')
-            else:
-                raw_norm = raw
-
-            try:
-                # Python 3.7+: fromisoformat can parse many ISO strings (without Z)
-                the_date = datetime.date.fromisoformat(raw_norm.split('T')[0])
-            except Exception:
-                # fallback to parsing whole timestamp if present
-                try:
-                    dt = datetime.datetime.fromisoformat(raw_norm)
-                    the_date = dt.date()
-                except Exception:
-                    the_date = None
-        except Exception:
-            the_date = None
-
-    if the_date is None:
-        # final fallback: try python-dateutil if installed
-        try:
-            from dateutil import parser as _du_parser
-            try:
-                dt = _du_parser.parse(raw)
-                the_date = dt.date()
-            except Exception:
-                the_date = None
-        except Exception:
-            the_date = None
-
-    if the_date is None:
-        logger.info("dmmu_batch_attendance_date: invalid date string received: %r (batch=%s) from %s", raw, batch_id, request.path)
-        return JsonResponse({'ok': False, 'error': f'Invalid date format: {raw!s}'}, status=400)
-
-    try:
-        att = BatchAttendance.objects.select_related('batch').prefetch_related('participant_records').get(batch_id=batch_id, date=the_date)
+        # the partial lists every participant row, so they stay prefetched, trimmed to the rendered columns;
+        # nothing reads att.batch, so no join for it
+        att = (
+            BatchAttendance.objects.only('id', 'date')
+            .prefetch_related(Prefetch(
+                'participant_records',
+                queryset=ParticipantAttendance.objects.only('id', 'attendance_id', 'participant_name', 'participant_role', 'present'),
+            ))
+            .get(batch_id=batch_id, date=the_date)
+        )
     except BatchAttendance.DoesNotExist:
         return JsonResponse({'ok': False, 'error': 'No attendance found'}, status=404)
     except Exception as e:
@@ -4817,7 +4888,7 @@ def dmmu_batch_attendance_date(request, batch_id, date_str):
 
     try:
         html = render_to_string('dmmu/partials/attendance_list.html', {'attendance': att}, request=request)
-        return JsonResponse({'ok': True, 'html': html})
+        return _fragment_json_response(html)
     except Exception as e:
         logger.exception("dmmu_batch_attendance_date: render error for batch %s date %s: %s", batch_id, the_date, e)
         return JsonResponse({'ok': False, 'error': 'Server error rendering attendance'}, status=500)
\ No newline at end of file